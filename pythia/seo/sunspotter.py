@@ -1,8 +1,10 @@
+import os
 import warnings
 from pathlib import Path
 
 import astropy.units as u
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from astropy.coordinates import SkyCoord
 from sunpy.map import Map, MapSequence
@@ -25,14 +27,16 @@ class Sunspotter:
         """
         Parameters
         ----------
-        timesfits : str
+        timesfits : str or pandas.DataFrame
             filepath to `lookup_timesfits.csv`
+            or to a Parquet copy of it, or its already loaded contents
             by default points to the Timesfits file from All Clear Dataset
             stored in `~pythia/data/all_clear`
         get_all_timesfits_columns : bool, optional
             Load all columns from the Timesfits CSV file, by default True
-        properties : str
+        properties : str or pandas.DataFrame
             filepath to `lookup_properties.csv`
+            or to a Parquet copy of it, or its already loaded contents
             by default points to the Properties file from All Clear Dataset
             stored in `~pythia/data/all_clear`
         get_all_properties_columns : bool, optional
@@ -43,8 +47,9 @@ class Sunspotter:
         properties_columns : list, optional
             Columns required from lookup_properties.csv, by default ['#id']
             Will be overridden if `get_all_properties_columns` is True.
-        classifications : str, optional
+        classifications : str or pandas.DataFrame, optional
             filepath to `classifications.csv`
+            or to a Parquet copy of it, or its already loaded contents
             Default behaviour is not to load the file, hence by default None
         classifications_columns : list, optional
             Columns required from `classifications.csv`
@@ -71,16 +76,33 @@ class Sunspotter:
 
         self._get_data(delimiter)
 
+    @staticmethod
+    def _read_file(filepath, delimiter: str, usecols=None):
+        if usecols is not None:
+            usecols = list(usecols)
+        if isinstance(filepath, pd.DataFrame):
+            # Copied, as the loaded data is modified in place.
+            if usecols is None:
+                return filepath.copy()
+            if not set(usecols).issubset(filepath.columns):
+                raise ValueError("Usecols do not match columns.")
+            return filepath[[column for column in filepath.columns if column in usecols]].copy()
+        is_filepath = isinstance(filepath, (str, os.PathLike))
+        # Parquet copies of the CSV files are read as is, skipping the delimiter scan.
+        if is_filepath and Path(filepath).suffix == '.parquet':
+            return pd.read_parquet(filepath, columns=usecols)
+        # Only local files can be memory mapped, URLs and buffers are read as before.
+        memory_map = is_filepath and '://' not in str(filepath)
+        return pd.read_csv(filepath, delimiter=delimiter, usecols=usecols, memory_map=memory_map)
+
     def _get_data(self, delimiter: str):
         # Reading the Timesfits file
         try:
             if self.get_all_timesfits_columns:
-                self.timesfits = pd.read_csv(self.timesfits,
-                                             delimiter=delimiter)
+                self.timesfits = self._read_file(self.timesfits, delimiter)
             else:
-                self.timesfits = pd.read_csv(self.timesfits,
-                                             delimiter=delimiter,
-                                             usecols=self.timesfits_columns)
+                self.timesfits = self._read_file(self.timesfits, delimiter,
+                                                 usecols=self.timesfits_columns)
         except ValueError:
             raise SunpyUserWarning("Sunspotter Object cannot be created."
                                    " Either the Timesfits columns do not match, or the file is corrupted")
@@ -97,16 +119,17 @@ class Sunspotter:
             self.timesfits.obs_date = pd.to_datetime(self.timesfits.obs_date,
                                                      format=self.datetime_fmt)
             self.timesfits.set_index("obs_date", inplace=True)
+            # The range lookups rely on the observations being in chronological order.
+            if not self.timesfits.index.is_monotonic_increasing:
+                self.timesfits.sort_index(kind='mergesort', inplace=True)
 
         # Reading the Properties file
         try:
             if self.get_all_properties_columns:
-                self.properties = pd.read_csv(self.properties,
-                                              delimiter=delimiter)
+                self.properties = self._read_file(self.properties, delimiter)
             else:
-                self.properties = pd.read_csv(self.properties,
-                                              delimiter=delimiter,
-                                              usecols=self.properties_columns)
+                self.properties = self._read_file(self.properties, delimiter,
+                                                  usecols=self.properties_columns)
         except ValueError:
             raise SunpyUserWarning("Sunspotter Object cannot be created."
                                    " Either the Properties columns do not match, or the file is corrupted")
@@ -122,6 +145,10 @@ class Sunspotter:
         if '#id' in self.properties.columns:
             self.properties.set_index("#id", inplace=True)
 
+        # The magnetic and Zurich classes take only a few distinct values.
+        categorical_columns = self.properties.columns.intersection(['hale', 'zurich'])
+        self.properties = self.properties.astype({column: 'category' for column in categorical_columns})
+
         # Reading the Classification file
         if self.classifications is not None:
 
@@ -129,9 +156,8 @@ class Sunspotter:
                 raise SunpyUserWarning("Classifications columns cannot be None"
                                        "  when classifications.csv is to be loaded.")
             try:
-                self.classifications = pd.read_csv(self.classifications,
-                                                   delimiter=delimiter,
-                                                   usecols=self.classifications_columns)
+                self.classifications = self._read_file(self.classifications, delimiter,
+                                                       usecols=self.classifications_columns)
             except ValueError:
                 raise SunpyUserWarning("Sunspotter Object cannot be created."
                                        " Either the Classifications columns do not match, or the file is corrupted")
@@ -343,13 +369,59 @@ class Sunspotter:
         >>> sunspotter.get_nearest_observation(obsdate)
         '2000-01-01 12:47:02'
         """
-        unique_dates = self.timesfits.index.unique()
-        index = unique_dates.get_loc(obsdate, method='nearest')
-        nearest_date = str(unique_dates[index])
-        if nearest_date != str(obsdate):  # casting to str because obsdate can be a pandas.Timestamp
+        return self.get_nearest_observations([obsdate])[0]
+
+    def get_nearest_observations(self, obsdates: list):
+        """
+        Returns the observation times and dates in the Timesfits that are
+        closest to each of the given observation times and dates.
+
+        Parameters
+        ----------
+        obsdates : list
+            The observation times and dates.
+
+        Returns
+        -------
+        closest_observations : list
+            Observation times and dates in the Timesfits that are
+            closest to each of the given observation times and dates.
+
+        Notes
+        -----
+        If a given observation is equally far from two observations
+        in the Timesfits, the later one is returned.
+
+        Examples
+        --------
+        >>> from pythia.seo import Sunspotter
+        >>> sunspotter = Sunspotter()
+        >>> obsdates = ['2000-01-01 22:47:02', '2000-01-02 12:51:02']
+        >>> sunspotter.get_nearest_observations(obsdates)
+        ['2000-01-01 12:47:02', '2000-01-02 12:51:02']
+        """
+        # The Timesfits is sorted by `obs_date`, so its index is binary searched as is.
+        # Observation dates repeat, but the rows just before and just after the
+        # insertion point still hold the nearest earlier and later observations.
+        all_dates = self.timesfits.index
+        obsdates = pd.DatetimeIndex(pd.to_datetime(obsdates))
+
+        after = np.clip(all_dates.searchsorted(obsdates), 0, len(all_dates) - 1)
+        before = np.clip(after - 1, 0, len(all_dates) - 1)
+        use_before = (obsdates - all_dates[before]) < (all_dates[after] - obsdates)
+        nearest_dates = all_dates[np.where(use_before, before, after)]
+
+        if not (nearest_dates == obsdates).all():
             warnings.warn(SunpyUserWarning("The given observation date isn't in the Timesfits file.\n"
                                            "Using the observation nearest to the given obsdate instead."))
-        return nearest_date
+        return [str(date) for date in nearest_dates]
+
+    def _get_timesfits_in_range(self, start: str, end: str):
+        # The Timesfits is sorted by `obs_date`, so both ends of the range are binary searched.
+        start, end = self.get_nearest_observations([start, end])
+        obs_dates = self.timesfits.index
+        return self.timesfits.iloc[obs_dates.searchsorted(pd.Timestamp(start), side='left'):
+                                   obs_dates.searchsorted(pd.Timestamp(end), side='right')]
 
     def get_all_observations_ids_in_range(self, start: str, end: str):
         """
@@ -379,9 +451,7 @@ class Sunspotter:
         >>> sunspotter.get_all_observations_ids_in_range(start, end)
         array([ 6,  7,  8,  9, 10, 11, 12, 13])
         """
-        start = self.get_nearest_observation(start)
-        end = self.get_nearest_observation(end)
-        return self.timesfits[start:end]['#id'].values
+        return self._get_timesfits_in_range(start, end)['#id'].values
 
     def get_fits_filenames_from_range(self, start: str, end: str):
         """
@@ -424,8 +494,7 @@ class Sunspotter:
         2000-01-03 12:51:02    20000103_1251_mdiB_1_8815.fits
         Name: filename, dtype: object
         """
-        ids_in_range = self.get_all_observations_ids_in_range(start, end)
-        return self.timesfits[self.timesfits['#id'].isin(ids_in_range)]['filename']
+        return self._get_timesfits_in_range(start, end)['filename']
 
     def get_mdi_fulldisk_fits_file(self, obsdate: str, filepath: str = str(path) + "/fulldisk/"):
         """
@@ -544,10 +613,7 @@ class Sunspotter:
                     '2000-01-15 12:47:02'],
                     dtype='datetime64[ns]', name='obs_date', freq=None)
         """
-        start = self.get_nearest_observation(start)
-        end = self.get_nearest_observation(end)
-
-        return self.timesfits[start: end].index.unique()
+        return self._get_timesfits_in_range(start, end).index.unique()
 
     def get_mdi_map_sequence(self, start: str, end: str, filepath: str = str(path) + "/fulldisk/"):
         """
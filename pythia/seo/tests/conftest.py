@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+from filelock import FileLock
+from pythia.seo.sunspotter import path
+
+all_clear_csv = {'timesfits': "lookup_timesfits.csv",
+                 'properties': "lookup_properties.csv",
+                 'classifications': "classifications.csv"}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers",
+                            "slow: reads the All Clear CSV files, deselect with '-m \"not slow\"'")
+    # Registered here too, so runs without pytest-xdist know the marker.
+    config.addinivalue_line("markers",
+                            "xdist_group(name): tests of a group run on one pytest-xdist worker")
+
+
+def _convert_to_parquet(csv_file, cache_dir, delimiter=';'):
+    """
+    Writes a Parquet copy of the given CSV file to the cache directory,
+    unless an up to date copy is already present.
+
+    The copy is written to a temporary file and then moved in place,
+    so a worker never reads a partially written file.
+    """
+    parquet_file = cache_dir / csv_file.with_suffix('.parquet').name
+    if not parquet_file.exists() or os.path.getmtime(parquet_file) < os.path.getmtime(csv_file):
+        temporary_file = parquet_file.with_suffix('.parquet.tmp')
+        pd.read_csv(csv_file, delimiter=delimiter).to_parquet(temporary_file)
+        os.replace(temporary_file, parquet_file)
+    return parquet_file
+
+
+@pytest.fixture(scope="session")
+def all_clear_files(request):
+    """
+    Filepaths to Parquet copies of the All Clear CSV files.
+
+    The copies are kept in the pytest cache directory, which is shared by
+    pytest-xdist workers and between test runs. Falls back to the CSV files
+    when no Parquet engine is installed, the cache is disabled, or the
+    copies cannot be written.
+    """
+    csv_files = {key: path / filename for key, filename in all_clear_csv.items()}
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        return csv_files
+
+    try:
+        cache_dir = cache.mkdir("all_clear")
+        # Every pytest-xdist worker runs this fixture, only one of them converts the files.
+        with FileLock(str(cache_dir / "parquet.lock")):
+            return {key: _convert_to_parquet(csv_file, cache_dir)
+                    for key, csv_file in csv_files.items()}
+    except (ImportError, OSError):
+        return csv_files
@@ -1,15 +1,56 @@
-from pathlib import Path
+import io
 
 import numpy as np
 import pandas as pd
 import pytest
-from pythia.seo.sunspotter import Sunspotter
+from pythia.seo.sunspotter import Sunspotter, path
 from sunpy.util import SunpyUserWarning
 
-path = Path.cwd() / "data/all_clear"
-
-
-@pytest.fixture
+timesfits_csv = str(path / "lookup_timesfits.csv")
+properties_csv = str(path / "lookup_properties.csv")
+classifications_csv = str(path / "classifications.csv")
+
+# The dtypes Sunspotter loads the CSV files with
+timesfits_dtypes = {'#id': 'int64', 'filename': 'object'}
+
+properties_dtypes = {'#id': 'int64', 'filename': 'object', 'zooniverse_id': 'object',
+                     'angle': 'float64', 'area': 'float64', 'areafrac': 'float64',
+                     'areathesh': 'float64', 'bipolesep': 'float64', 'c1flr24hr': 'int64',
+                     'id_filename': 'int64', 'flux': 'float64', 'fluxfrac': 'float64',
+                     'hale': 'category', 'hcpos_x': 'float64', 'hcpos_y': 'float64',
+                     'm1flr12hr': 'int64', 'm5flr12hr': 'int64', 'n_nar': 'int64',
+                     'noaa': 'int64', 'pxpos_x': 'float64', 'pxpos_y': 'float64',
+                     'sszn': 'int64', 'zurich': 'category'}
+
+# Observation dates and the Timesfits observation closest to each of them
+nearest_observations = [('2000-01-02 00:49:02', '2000-01-02 12:51:02'),
+                        ('2000-01-02 00:49:01', '2000-01-01 12:47:02'),
+                        ('1999-01-01 00:00:00', '2000-01-01 12:47:02'),
+                        ('2100-01-01 00:00:00', '2005-12-31 12:48:02')]
+
+# FITS filenames for the observations of 2000-01-02 12:51:02
+one_day_filenames = np.array(['20000102_1251_mdiB_1_8810.fits', '20000102_1251_mdiB_1_8813.fits',
+                              '20000102_1251_mdiB_1_8814.fits', '20000102_1251_mdiB_1_8815.fits'],
+                             dtype='<U32')
+# FITS filenames for the observations from 2000-01-02 12:51:02 to 2000-01-03 12:51:02
+two_day_filenames = np.array(['20000102_1251_mdiB_1_8810.fits', '20000102_1251_mdiB_1_8813.fits',
+                              '20000102_1251_mdiB_1_8814.fits', '20000102_1251_mdiB_1_8815.fits',
+                              '20000103_1251_mdiB_1_8810.fits', '20000103_1251_mdiB_1_8813.fits',
+                              '20000103_1251_mdiB_1_8814.fits', '20000103_1251_mdiB_1_8815.fits'],
+                             dtype='<U32')
+one_day_filenames.flags.writeable = False
+two_day_filenames.flags.writeable = False
+
+# Observation datetimes from 2000-01-01 12:47:02 to 2000-01-15 12:47:02
+fortnight_obslist = pd.to_datetime(['2000-01-01 12:47:02', '2000-01-02 12:51:02',
+                                    '2000-01-03 12:51:02', '2000-01-04 12:51:02',
+                                    '2000-01-05 12:51:02', '2000-01-06 12:51:02',
+                                    '2000-01-11 12:51:02', '2000-01-12 12:51:02',
+                                    '2000-01-13 12:51:02', '2000-01-14 12:47:02',
+                                    '2000-01-15 12:47:02']).rename('obs_date')
+
+
+@pytest.fixture(scope="session")
 def properties_columns():
     return ['#id', 'filename', 'zooniverse_id', 'angle', 'area', 'areafrac',
             'areathesh', 'bipolesep', 'c1flr24hr', 'id_filename', 'flux',
@@ -18,67 +59,110 @@ def properties_columns():
 
 
 @pytest.fixture
-def properties(properties_columns):
+def properties():
     # Properties corresponding to `obs_date` '2000-01-01 12:47:02' and `#id` 1
-    data = [[1, '530be1183ae74079c300000d.jpg', 'ASZ000090y', 37.8021,
-             34400.0, 0.12, 2890.0, 3.72, 0, 1, 2.18e+22, 0.01, 'beta', 452.26991,
-             443.92976, 0, 0, 1, 8809, 229.19343999999998, 166.877, 1, 'bxo']]
-
-    return pd.DataFrame(data=data, columns=properties_columns)
-
-
-@pytest.fixture
+    # with the same dtypes as the Properties loaded by Sunspotter
+    data = {'#id': np.array([1], dtype='int64'),
+            'filename': np.array(['530be1183ae74079c300000d.jpg'], dtype=object),
+            'zooniverse_id': np.array(['ASZ000090y'], dtype=object),
+            'angle': np.array([37.8021], dtype='float64'),
+            'area': np.array([34400.0], dtype='float64'),
+            'areafrac': np.array([0.12], dtype='float64'),
+            'areathesh': np.array([2890.0], dtype='float64'),
+            'bipolesep': np.array([3.72], dtype='float64'),
+            'c1flr24hr': np.array([0], dtype='int64'),
+            'id_filename': np.array([1], dtype='int64'),
+            'flux': np.array([2.18e+22], dtype='float64'),
+            'fluxfrac': np.array([0.01], dtype='float64'),
+            'hale': pd.Categorical(['beta']),
+            'hcpos_x': np.array([452.26991], dtype='float64'),
+            'hcpos_y': np.array([443.92976], dtype='float64'),
+            'm1flr12hr': np.array([0], dtype='int64'),
+            'm5flr12hr': np.array([0], dtype='int64'),
+            'n_nar': np.array([1], dtype='int64'),
+            'noaa': np.array([8809], dtype='int64'),
+            'pxpos_x': np.array([229.19344], dtype='float64'),
+            'pxpos_y': np.array([166.877], dtype='float64'),
+            'sszn': np.array([1], dtype='int64'),
+            'zurich': pd.Categorical(['bxo'])}
+
+    return pd.DataFrame(data)
+
+
+@pytest.fixture(scope="session")
 def timesfits_columns():
     return ['#id', 'filename', 'obs_date']
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def classifications_columns():
     return ['#id', 'zooniverse_class', 'user_id', 'image_id_0', 'image_id_1',
             'image0_more_complex_image1', 'used_inverted', 'bin', 'date_created',
             'date_started', 'date_finished']
 
 
-@pytest.fixture
-def sunspotter(properties_columns, timesfits_columns, classifications_columns):
-    return Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                      properties=path / "lookup_properties.csv",
-                      classifications=path / "classifications.csv",
+@pytest.fixture(scope="session")
+def sunspotter(all_clear_files, properties_columns, timesfits_columns, classifications_columns):
+    return Sunspotter(timesfits=all_clear_files['timesfits'],
+                      properties=all_clear_files['properties'],
+                      classifications=all_clear_files['classifications'],
                       delimiter=';',
                       timesfits_columns=timesfits_columns,
                       properties_columns=properties_columns,
                       classifications_columns=classifications_columns)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def raw_timesfits(timesfits_columns):
+    # Parsed once per session, tests must not modify it.
+    return pd.read_csv(timesfits_csv, delimiter=';', engine='c',
+                       memory_map=True, usecols=timesfits_columns,
+                       dtype=timesfits_dtypes, parse_dates=['obs_date'])
+
+
+@pytest.fixture(scope="session")
+def raw_properties(properties_columns):
+    # Parsed once per session, tests must not modify it.
+    return pd.read_csv(properties_csv, delimiter=';', engine='c',
+                       memory_map=True, usecols=properties_columns,
+                       dtype=properties_dtypes)
+
+
+@pytest.fixture(scope="session")
+def classifications_df():
+    # Parsed once per session, Sunspotter copies it before use.
+    return pd.read_csv(classifications_csv, delimiter=';')
+
+
+@pytest.fixture(scope="session")
 def obsdate():
     # `obs_date` corresponding to `#id` 1
     return '2000-01-01 12:47:02'
 
 
-def test_sunspotter_no_parameters():
-    timesfits = pd.read_csv(path / "lookup_timesfits.csv", delimiter=';')
-    properties = pd.read_csv(path / "lookup_properties.csv", delimiter=';')
-
+@pytest.mark.xdist_group(name="sunspotter_io")
+@pytest.mark.slow
+def test_sunspotter_no_parameters(raw_timesfits, raw_properties):
     # get all columns is by default True for both Timesfits and Properties.
     sunspotter = Sunspotter()
 
-    # To get obs_date back a column of dtype `str`
+    # To get obs_date and #id back as columns
     sunspotter.timesfits.reset_index(inplace=True)
-    sunspotter.timesfits.obs_date = sunspotter.timesfits.obs_date.dt.strftime('%Y-%m-%d %H:%M:%S')
-
-    # To get #id back a column of dtype int
     sunspotter.properties.reset_index(inplace=True)
 
-    # Sorting columns as the order of Columns shouldn't matter
-    assert sunspotter.timesfits.sort_index(axis=1).equals(timesfits.sort_index(axis=1))
-    assert sunspotter.properties.sort_index(axis=1).equals(properties.sort_index(axis=1))
+    # Aligning columns to the CSV order, as the order of Columns shouldn't matter
+    assert set(sunspotter.timesfits.columns) == set(raw_timesfits.columns)
+    assert set(sunspotter.properties.columns) == set(raw_properties.columns)
+    assert sunspotter.timesfits.reindex(columns=raw_timesfits.columns, copy=False).equals(raw_timesfits)
+    assert sunspotter.properties.reindex(columns=raw_properties.columns, copy=False).equals(raw_properties)
 
 
+@pytest.mark.xdist_group(name="sunspotter_io")
+@pytest.mark.slow
 def test_sunspotter_base_object(properties_columns, timesfits_columns):
 
-    sunspotter = Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                            properties=path / "lookup_properties.csv",
+    sunspotter = Sunspotter(timesfits=timesfits_csv,
+                            properties=properties_csv,
                             timesfits_columns=timesfits_columns,
                             properties_columns=properties_columns)
 
@@ -86,65 +170,84 @@ def test_sunspotter_base_object(properties_columns, timesfits_columns):
     assert set(sunspotter.timesfits_columns) == set(timesfits_columns)
 
 
-def test_sunspotter_with_classifications(classifications_columns):
+@pytest.mark.xdist_group(name="sunspotter_io")
+@pytest.mark.slow
+def test_sunspotter_from_buffer_and_url(timesfits_columns):
+    with open(timesfits_csv) as timesfits:
+        timesfits_buffer = io.StringIO(timesfits.read())
 
-    sunspotter = Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                            properties=path / "lookup_properties.csv")
+    sunspotter = Sunspotter(timesfits=timesfits_buffer,
+                            properties=(path / "lookup_properties.csv").as_uri(),
+                            timesfits_columns=timesfits_columns)
+
+    assert sunspotter.get_timesfits_id('2000-01-01 12:47:02') == 1
+
+
+@pytest.mark.xdist_group(name="sunspotter_io")
+@pytest.mark.slow
+def test_sunspotter_with_classifications(classifications_df, classifications_columns):
+
+    sunspotter = Sunspotter(timesfits=timesfits_csv,
+                            properties=properties_csv)
 
     assert sunspotter.classifications_columns is None
     assert sunspotter.classifications is None
 
     with pytest.raises(SunpyUserWarning):
         # Because Classifications Columns aren't specified.
-        Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                   properties=path / "lookup_properties.csv",
-                   classifications=path / "classifications.csv")
+        Sunspotter(timesfits=timesfits_csv,
+                   properties=properties_csv,
+                   classifications=classifications_df)
 
     assert sunspotter.classifications_columns is None
     assert sunspotter.classifications is None
 
-    sunspotter = Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                            properties=path / "lookup_properties.csv",
-                            classifications=path / "classifications.csv",
+    sunspotter = Sunspotter(timesfits=timesfits_csv,
+                            properties=properties_csv,
+                            classifications=classifications_df,
                             classifications_columns=classifications_columns)
 
     assert set(sunspotter.classifications_columns) == set(classifications_columns)
-
-
-def test_sunspotter_incorrect_delimiter():
+    assert sunspotter.classifications.equals(classifications_df)
+    assert sunspotter.classifications is not classifications_df
+
+
+@pytest.mark.xdist_group(name="sunspotter_io")
+@pytest.mark.slow
+@pytest.mark.parametrize("kwargs",
+                         [dict(delimiter=','),
+                          dict(properties_columns=["This shouldn't be present"], delimiter=';'),
+                          dict(classifications=classifications_csv,
+                               classifications_columns=["This shouldn't be present"], delimiter=';'),
+                          dict(classifications=pd.DataFrame({'#id': [1]}),
+                               classifications_columns=["This shouldn't be present"], delimiter=';'),
+                          dict(timesfits_columns=["This shouldn't be present"], delimiter=';')],
+                         ids=['delimiter', 'properties_columns', 'classifications_columns',
+                              'classifications_dataframe_columns', 'timesfits_columns'])
+def test_sunspotter_init_errors(kwargs):
 
     with pytest.raises(SunpyUserWarning):
-        Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                   properties=path / "lookup_properties.csv",
-                   delimiter=',')
-
-
-def test_sunspotter_properties_columns():
+        Sunspotter(timesfits=timesfits_csv,
+                   properties=properties_csv,
+                   **kwargs)
 
-    with pytest.raises(SunpyUserWarning):
-        Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                   properties=path / "lookup_properties.csv",
-                   properties_columns=["This shouldn't be present"],
-                   delimiter=';')
 
+@pytest.mark.xdist_group(name="sunspotter_io")
+@pytest.mark.slow
+def test_sunspotter_sorts_timesfits(tmp_path, timesfits_columns):
+    timesfits = pd.read_csv(timesfits_csv, delimiter=';', nrows=20)
+    timesfits[::-1].to_csv(tmp_path / "lookup_timesfits.csv", sep=';', index=False)
 
-def test_sunspotter_classifications_columns():
+    sunspotter = Sunspotter(timesfits=tmp_path / "lookup_timesfits.csv",
+                            properties=properties_csv,
+                            timesfits_columns=timesfits_columns)
 
-    with pytest.raises(SunpyUserWarning):
-        Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                   properties=path / "lookup_properties.csv",
-                   classifications=path / "classifications.csv",
-                   classifications_columns=["This shouldn't be present"],
-                   delimiter=';')
+    assert sunspotter.timesfits.index.is_monotonic_increasing
+    assert np.array_equal(sunspotter.get_all_ids_for_observation('2000-01-01 12:47:02'), [5, 4, 3, 2, 1])
 
 
-def test_sunspotter_timesfits_columns():
-
-    with pytest.raises(SunpyUserWarning):
-        Sunspotter(timesfits=path / "lookup_timesfits.csv",
-                   properties=path / "lookup_properties.csv",
-                   timesfits_columns=["This shouldn't be present"],
-                   delimiter=';')
+def test_timesfits_sorted_by_obsdate(sunspotter):
+    assert sunspotter.timesfits.index.is_monotonic_increasing
 
 
 def test_get_timesfits_id(sunspotter, obsdate):
@@ -153,60 +256,89 @@ def test_get_timesfits_id(sunspotter, obsdate):
 
 def test_get_all_ids_for_observation(sunspotter, obsdate):
 
-    assert all(sunspotter.get_all_ids_for_observation(obsdate) == np.array([1, 2, 3, 4, 5]))
+    assert np.array_equal(sunspotter.get_all_ids_for_observation(obsdate), [1, 2, 3, 4, 5])
 
 
 def test_get_properties(sunspotter, properties):
     properties.set_index("#id", inplace=True)
-    assert sunspotter.get_properties(1).equals(properties.iloc[0])
+    observed_properties = sunspotter.get_properties(1)
+    np.testing.assert_array_equal(observed_properties.index.values, properties.columns.values)
+    np.testing.assert_array_equal(observed_properties.to_numpy(), properties.iloc[0].to_numpy())
+    assert observed_properties.name == properties.index[0]
 
 
 def test_get_properties_from_obsdate(sunspotter, obsdate, properties):
     properties.set_index("#id", inplace=True)
-    assert sunspotter.get_properties_from_obsdate(obsdate).equals(properties.iloc[0])
+    observed_properties = sunspotter.get_properties_from_obsdate(obsdate)
+    np.testing.assert_array_equal(observed_properties.index.values, properties.columns.values)
+    np.testing.assert_array_equal(observed_properties.to_numpy(), properties.iloc[0].to_numpy())
+    assert observed_properties.name == properties.index[0]
 
 
 def test_number_of_observations(sunspotter, obsdate):
     assert sunspotter.number_of_observations(obsdate) == 5
 
 
-@pytest.mark.parametrize("obsdate,closest_date",
-                         [('2000-01-02 00:49:02', '2000-01-02 12:51:02'),
-                          ('2000-01-02 00:49:01', '2000-01-01 12:47:02'),
-                          ('1999-01-01 00:00:00', '2000-01-01 12:47:02'),
-                          ('2100-01-01 00:00:00', '2005-12-31 12:48:02')])
+@pytest.mark.parametrize("obsdate,closest_date", nearest_observations)
 def test_get_nearest_observation(sunspotter, obsdate, closest_date):
     with pytest.warns(SunpyUserWarning):
         assert sunspotter.get_nearest_observation(obsdate) == closest_date
 
 
+def test_get_nearest_observations(sunspotter):
+    obsdates, closest_dates = zip(*nearest_observations)
+    with pytest.warns(SunpyUserWarning):
+        assert sunspotter.get_nearest_observations(obsdates) == list(closest_dates)
+
+
 def test_get_all_observations_ids_in_range(sunspotter):
     start = '2000-01-02 12:51:02'
     end = '2000-01-03 12:51:02'
-    assert all(sunspotter.get_all_observations_ids_in_range(start, end) == np.array([6, 7, 8, 9, 10, 11, 12, 13]))
+    assert np.array_equal(sunspotter.get_all_observations_ids_in_range(start, end),
+                          [6, 7, 8, 9, 10, 11, 12, 13])
+
+
+@pytest.fixture
+def large_timesfits():
+    # Like the All Clear Timesfits, every observation date is shared by several rows.
+    obs_dates = pd.date_range('2000-01-01 00:00:00', periods=20000,
+                              freq=pd.Timedelta(hours=1), name='obs_date').repeat(5)
+    return pd.DataFrame({'#id': np.arange(1, len(obs_dates) + 1)}, index=obs_dates)
+
+
+def test_get_all_observations_ids_in_range_large_timesfits(sunspotter, monkeypatch, large_timesfits):
+    monkeypatch.setattr(sunspotter, 'timesfits', large_timesfits)
+
+    start = '2001-01-01 00:00:00'
+    end = '2001-01-01 03:00:00'
+    ids = sunspotter.get_all_observations_ids_in_range(start, end)
+    assert np.array_equal(ids, large_timesfits.loc[start:end, '#id'].values)
+    assert len(ids) == 20
+
+
+def test_get_nearest_observations_repeated_dates(sunspotter, monkeypatch, large_timesfits):
+    monkeypatch.setattr(sunspotter, 'timesfits', large_timesfits)
+
+    # Half an hour is equally far from both observations, the later one is used.
+    obsdates = ['2001-01-01 00:29:59', '2001-01-01 00:30:00']
+    with pytest.warns(SunpyUserWarning):
+        assert sunspotter.get_nearest_observations(obsdates) == ['2001-01-01 00:00:00', '2001-01-01 01:00:00']
+
+
+def test_get_fits_filenames_from_range(sunspotter):
+    filenames = sunspotter.get_fits_filenames_from_range('2000-01-02 12:51:02', '2000-01-03 12:51:02')
+    filenames = filenames.to_numpy().astype('<U32')
+    assert np.array_equal(filenames, two_day_filenames)
+    # The first day of the range holds the first four observations.
+    assert np.array_equal(filenames[:4], one_day_filenames)
 
 
-@pytest.mark.parametrize("start,end,filenames",
-                        [('2000-01-02 12:51:02', '2000-01-03 12:51:02',
-                         np.array(['20000102_1251_mdiB_1_8810.fits', '20000102_1251_mdiB_1_8813.fits',
-                                   '20000102_1251_mdiB_1_8814.fits', '20000102_1251_mdiB_1_8815.fits',
-                                   '20000103_1251_mdiB_1_8810.fits', '20000103_1251_mdiB_1_8813.fits',
-                                   '20000103_1251_mdiB_1_8814.fits', '20000103_1251_mdiB_1_8815.fits'], dtype=object)),
-                         ('2000-01-02 12:51:02', '2000-01-02 12:51:02',
-                         np.array(['20000102_1251_mdiB_1_8810.fits', '20000102_1251_mdiB_1_8813.fits',
-                                   '20000102_1251_mdiB_1_8814.fits', '20000102_1251_mdiB_1_8815.fits'], dtype=object))])
-def test_get_fits_filenames_from_range(sunspotter, start, end, filenames):
-    assert all(sunspotter.get_fits_filenames_from_range(start, end).values == filenames)
+def test_get_fits_filenames_from_single_observation(sunspotter):
+    filenames = sunspotter.get_fits_filenames_from_range('2000-01-02 12:51:02', '2000-01-02 12:51:02')
+    assert np.array_equal(filenames.to_numpy().astype('<U32'), one_day_filenames)
 
 
 @pytest.mark.parametrize("start,end,obslist",
-                        [('2000-01-01 12:47:02', '2000-01-15 12:47:02',
-                         pd.DatetimeIndex(['2000-01-01 12:47:02', '2000-01-02 12:51:02',
-                                           '2000-01-03 12:51:02', '2000-01-04 12:51:02',
-                                           '2000-01-05 12:51:02', '2000-01-06 12:51:02',
-                                           '2000-01-11 12:51:02', '2000-01-12 12:51:02',
-                                           '2000-01-13 12:51:02', '2000-01-14 12:47:02',
-                                           '2000-01-15 12:47:02'],
-                                           dtype='datetime64[ns]', name='obs_date', freq=None))])
+                         [('2000-01-01 12:47:02', '2000-01-15 12:47:02', fortnight_obslist)])
 def test_get_available_obsdatetime_range(sunspotter, start, end, obslist):
     assert all(sunspotter.get_available_obsdatetime_range(start, end) == obslist)